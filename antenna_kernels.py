@@ -0,0 +1,190 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+# ============================================================
+# ANTENNA LIBRARY
+# ============================================================
+ANTENNAS = {
+    "Wire Antennas": ["Half-wave Dipole","Rod / Whip Monopole","Small Loop","Large Loop","Helical","Rubber Duck","Inverted-F (IFA)","PIFA"],
+    "Aperture Antennas": ["Waveguide Opening","Horn (Pyramidal)","Horn (Conical)","Slot"],
+    "Reflector Antennas": ["Parabolic Dish","Corner Reflector","Flat Sheet Reflector"],
+    "Microstrip Patch": ["Rectangular Patch","Patch Array"],
+    "Antenna Arrays": ["Yagi-Uda","Log-Periodic Dipole Array","Phased Array","Bow-Tie"],
+    "Lens Antennas": ["Convex-Plane","Concave-Plane","Convex-Convex"],
+    "Special Antennas": ["Ground Plane","Mast Radiator","Omni-Directional"]
+}
+ANTENNA_NAMES = list(ANTENNAS)
+
+# ============================================================
+# ANGULAR GRID
+# ============================================================
+# built once when the module is imported and shared read-only by every session
+theta = np.linspace(0, np.pi, 360, dtype=np.float32)
+theta_deg = np.rad2deg(theta)
+cos_theta = np.cos(theta)
+sin_theta = np.sin(theta)
+for _arr in (theta, theta_deg, cos_theta, sin_theta):
+    _arr.setflags(write=False)
+
+# (theta, phi) samples of the 3D surface; the 2D views keep the full theta grid
+SURFACE_QUALITY = {"Low": (90, 45), "Medium": (180, 90), "High": (360, 180)}
+
+@lru_cache(maxsize=len(SURFACE_QUALITY))
+def _surface_grid(n_theta, n_phi):
+    th = np.linspace(0, np.pi, n_theta, dtype=np.float32)
+    ph = np.linspace(0, 2*np.pi, n_phi, dtype=np.float32)
+    grid = (th, np.cos(th), np.sin(th), np.cos(ph), np.sin(ph))
+    for arr in grid:
+        arr.setflags(write=False)
+    return grid
+
+# element patterns that depend only on the grid
+_cos2 = cos_theta*cos_theta
+_ELEMENT_PATTERNS = {
+    "dipole": sin_theta,
+    "loop": _cos2,
+    "helical": _cos2*cos_theta,
+    "horn": np.exp(-theta*theta),
+    "reflector": _cos2*_cos2,
+    "patch": cos_theta,
+    "bow-tie": np.abs(np.sin(2*theta)),
+    "omni": np.ones_like(theta),
+    "default": np.abs(cos_theta),
+}
+for _arr in _ELEMENT_PATTERNS.values():
+    _arr.setflags(write=False)
+
+# ============================================================
+# RADIATION MODELS
+# ============================================================
+def array_pattern(N, d, phase, cos_t):
+    # buf holds [N*psi/2, psi/2]
+    n = cos_t.size
+    buf = np.empty(2*n, dtype=np.float32)
+    num, den = buf[:n], buf[n:]
+    np.multiply(cos_t, math.pi*d, out=den)
+    den += math.radians(phase)/2
+    np.multiply(den, N, out=num)
+    np.sin(buf, out=buf)
+    # psi/2 = k*pi (main and grating lobes) is a removable 0/0 whose limit is N
+    singular = np.abs(den) < 1e-4
+    np.divide(num, den, out=num, where=~singular)
+    af = np.abs(num)
+    af[singular] = N
+    return af
+
+# slider spacing snaps to 0.01 wavelengths, so the binned key is exact
+@lru_cache(maxsize=2048)
+def _array_pattern_binned(N, spacing_bin, phase):
+    af = array_pattern(N, spacing_bin/100, phase, cos_theta)
+    af.setflags(write=False)
+    return af
+
+# models not listed fall back to the "default" element pattern
+_MODEL_PATTERNS = {
+    "Half-wave Dipole": "dipole", "Rod / Whip Monopole": "dipole",
+    "Small Loop": "loop", "Large Loop": "loop",
+    "Helical": "helical", "Rubber Duck": "helical",
+    "Inverted-F (IFA)": "patch", "PIFA": "patch",
+    "Rectangular Patch": "patch", "Patch Array": "patch",
+    "Waveguide Opening": "horn", "Horn (Pyramidal)": "horn", "Horn (Conical)": "horn",
+    "Parabolic Dish": "reflector", "Corner Reflector": "reflector", "Flat Sheet Reflector": "reflector",
+    "Yagi-Uda": "array", "Log-Periodic Dipole Array": "array", "Phased Array": "array",
+    "Bow-Tie": "bow-tie",
+    "Omni-Directional": "omni",
+}
+# a misspelt or renamed model would silently fall back to "default", so
+# check the table against the library when the module is imported
+_unknown = set(_MODEL_PATTERNS).difference(*ANTENNAS.values())
+assert not _unknown, f"_MODEL_PATTERNS names models missing from ANTENNAS: {sorted(_unknown)}"
+_unknown = set(_MODEL_PATTERNS.values()).difference(_ELEMENT_PATTERNS, {"array"})
+assert not _unknown, f"_MODEL_PATTERNS names unknown element patterns: {sorted(_unknown)}"
+
+def get_pattern(model, elements, spacing, phase):
+    kind = _MODEL_PATTERNS.get(model, "default")
+    if kind == "array":
+        return _array_pattern_binned(elements, round(spacing*100), phase)
+    return _ELEMENT_PATTERNS[kind]
+
+def apply_polarization(pattern, polarization, cos_t=cos_theta, sin_t=sin_theta):
+    if "Horizontal" in polarization:
+        return pattern*cos_t
+    elif "RHCP" in polarization:
+        return pattern*(1 + 0.1*sin_t)
+    elif "LHCP" in polarization:
+        return pattern*(1 - 0.1*sin_t)
+    return pattern
+
+def normalize(pattern):
+    peak_index = int(np.argmax(pattern))
+    peak = float(pattern[peak_index])
+    if peak == 0:
+        return pattern, peak_index
+    # the cached element patterns are read-only, so only scale in place when allowed
+    pattern = np.multiply(pattern, np.float32(1.0/peak), out=pattern if pattern.flags.writeable else None)
+    return pattern, peak_index
+
+def compute_pattern(model, elements, spacing, phase, polarization):
+    pattern = apply_polarization(get_pattern(model, elements, spacing, phase), polarization)
+    pattern, peak_index = normalize(pattern)
+    # array_pattern substitutes the analytic limit at its 0/0 points
+    assert np.isfinite(pattern).all(), f"non-finite pattern for {model}"
+    return pattern, peak_index
+
+def near_field_pattern(pattern):
+    return normalize(pattern/(1+theta**2))[0]
+
+# ============================================================
+# METRICS
+# ============================================================
+# compute_pattern has already normalised the peak to 1
+_HALF_POWER = 1/math.sqrt(2)
+
+def _crossing(pattern, a, b):
+    # linear interpolation of the half-power crossing between samples a and b
+    p_a, p_b = float(pattern[a]), float(pattern[b])
+    t_a, t_b = float(theta_deg[a]), float(theta_deg[b])
+    return t_a + (_HALF_POWER - p_a)/(p_b - p_a)*(t_b - t_a)
+
+def half_power_beamwidth(pattern, peak_index):
+    if pattern[peak_index] == 0:
+        return 0.0
+    # walk out from the peak to the first sample below half power on each side
+    below = pattern < _HALF_POWER
+    i = int(below[peak_index::-1].argmax())
+    first = peak_index - i + 1 if i else 0
+    j = int(below[peak_index:].argmax())
+    last = peak_index + j - 1 if j else pattern.size - 1
+    left = float(theta_deg[first]) if first == 0 else _crossing(pattern, first-1, first)
+    right = float(theta_deg[last]) if last == pattern.size - 1 else _crossing(pattern, last, last+1)
+    return right - left
+
+# ============================================================
+# PLOTS
+# ============================================================
+def plot_2d_polar(pattern):
+    fig = go.Figure(go.Scatterpolar(r=pattern, theta=theta_deg, fill='toself', line=dict(color='cyan')))
+    fig.update_layout(title="Radiation Pattern",
+                      polar=dict(radialaxis=dict(range=[min(0.0, float(pattern.min())), 1])))
+    return fig
+
+def plot_near_far(near_pattern, far_pattern):
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(r=near_pattern, theta=theta_deg, mode='lines', name="Near Field"))
+    fig.add_trace(go.Scatterpolar(r=far_pattern, theta=theta_deg, mode='lines', name="Far Field"))
+    return fig
+
+def surface_mesh(pattern, n_theta, n_phi):
+    th, cos_t, sin_t, cos_p, sin_p = _surface_grid(n_theta, n_phi)
+    pattern = np.interp(th, theta, pattern).astype(np.float32)
+    r_sin = pattern*sin_t
+    XY = np.empty((2, n_phi, n_theta), dtype=np.float32)
+    np.multiply.outer(cos_p, r_sin, out=XY[0])
+    np.multiply.outer(sin_p, r_sin, out=XY[1])
+    X, Y = XY
+    Z = np.broadcast_to((pattern*cos_t)[None,:], X.shape)
+    R = np.broadcast_to(pattern[None,:], X.shape)
+    return X, Y, Z, R
@@ -0,0 +1,13 @@
+import pandas as pd
+
+# ============================================================
+# QUICK REFERENCE
+# ============================================================
+# built once per process and shared by every session; it is display-only
+# data, so callers must treat it as read-only
+REFERENCE_TABLE = pd.DataFrame({
+    "Antenna": ["Dipole","Patch","Yagi","Dish","Horn"],
+    "Size": ["λ/2","λ/2","Multi","Large","Large"],
+    "Gain": ["2.15 dBi","6–9 dBi","10–15 dBi","30+ dBi","10–25 dBi"],
+    "Applications": ["TV, RF","WiFi, GPS","TV","Satellite","Radar"]
+})
@@ -1,7 +1,11 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
+
+from antenna_kernels import (ANTENNAS, ANTENNA_NAMES, compute_pattern, near_field_pattern,
+                             half_power_beamwidth, plot_2d_polar, plot_near_far, surface_mesh,
+                             SURFACE_QUALITY)
+from antenna_reference import REFERENCE_TABLE
 
 # ============================================================
 # PAGE CONFIG
@@ -11,7 +15,7 @@ st.set_page_config(page_title="Antenna Simulator", layout="wide", page_icon="
 # ============================================================
 # THEME
 # ============================================================
-st.markdown("""
+CSS = """
 <style>
 .stApp {
     background: radial-gradient(circle at center, #0c2d65 0%, #000000 90%);
@@ -20,98 +24,59 @@ st.markdown("""
 }
 h1,h2,h3 { color:#60a5fa; }
 </style>
-""", unsafe_allow_html=True)
-# ============================================================
-# ANTENNA LIBRARY
-# ============================================================
-ANTENNAS = {
-    "Wire Antennas": ["Half-wave Dipole","Rod / Whip Monopole","Small Loop","Large Loop","Helical","Rubber Duck","Inverted-F (IFA)","PIFA"],
-    "Aperture Antennas": ["Waveguide Opening","Horn (Pyramidal)","Horn (Conical)","Slot"],
-    "Reflector Antennas": ["Parabolic Dish","Corner Reflector","Flat Sheet Reflector"],
-    "Microstrip Patch": ["Rectangular Patch","Patch Array"],
-    "Antenna Arrays": ["Yagi-Uda","Log-Periodic Dipole Array","Phased Array","Bow-Tie"],
-    "Lens Antennas": ["Convex-Plane","Concave-Plane","Convex-Convex"],
-    "Special Antennas": ["Ground Plane","Mast Radiator","Omni-Directional"]
-}
+"""
 
+st.markdown(CSS, unsafe_allow_html=True)
 # ============================================================
 # SIDEBAR CONTROLS
 # ============================================================
 st.sidebar.title("📡 Antenna Controls")
 
-family = st.sidebar.selectbox("Antenna Family", list(ANTENNAS.keys()))
+family = st.sidebar.selectbox("Antenna Family", ANTENNA_NAMES)
 model = st.sidebar.selectbox("Model", ANTENNAS[family])
-frequency = st.sidebar.slider("Frequency (MHz)", 100, 60000, 3000)
-gain = st.sidebar.slider("Gain (dBi)", 0, 25, 8)
-efficiency = st.sidebar.slider("Efficiency (%)", 10, 100, 85)
-
-elements = st.sidebar.slider("Array Elements", 2, 128, 16)
-spacing = st.sidebar.slider("Element Spacing (λ)", 0.1, 2.0, 0.5)
-phase = st.sidebar.slider("Phase Shift (deg)", -180, 180, 0)
-
-polarization = st.sidebar.selectbox("Polarization",
-    ["Linear (Vertical)","Linear (Horizontal)","Circular (RHCP)","Circular (LHCP)"])
-
-field_region = st.sidebar.radio("Field Region", ["Far Field","Near Field"])
-
-# RF parameters
-st.sidebar.subheader("RF Parameters")
-Z0 = st.sidebar.number_input("Characteristic Impedance Z0 (Ω)", value=50.0)
-ZL = st.sidebar.number_input("Load Impedance ZL (Ω)", value=75.0)
-distance = st.sidebar.number_input("Tx-Rx Distance (m)", value=10.0)
-tx_power = st.sidebar.number_input("Transmit Power (dBm)", value=20.0)
-
-theta = np.linspace(0, np.pi, 360)
-theta_deg = np.rad2deg(theta)
-
-# ============================================================
-# RADIATION MODELS
-# ============================================================
-def array_pattern(N, d, phase, theta):
-    psi = 2*np.pi*d*np.cos(theta) + np.deg2rad(phase)
-    return np.abs(np.sin(N*psi/2)/(np.sin(psi/2)+1e-9))
-
-def get_pattern(model):
-    if "Dipole" in model or "Monopole" in model:
-        return np.sin(theta)
-    elif "Loop" in model:
-        return np.cos(theta)**2
-    elif "Helical" in model or "Rubber" in model:
-        return np.cos(theta)**3
-    elif "Horn" in model or "Waveguide" in model:
-        return np.exp(-theta**2)
-    elif "Dish" in model or "Reflector" in model:
-        return np.cos(theta)**4
-    elif "Patch" in model or "IFA" in model:
-        return np.cos(theta)
-    elif "Yagi" in model or "Log-Periodic" in model or "Phased Array" in model:
-        return array_pattern(elements, spacing, phase, theta)
-    elif "Bow-Tie" in model:
-        return np.abs(np.sin(2*theta))
-    elif "Omni" in model:
-        return np.ones_like(theta)
-    else:
-        return np.abs(np.cos(theta))
-
-def apply_polarization(pattern):
-    if "Horizontal" in polarization:
-        pattern *= np.cos(theta)
-    elif "RHCP" in polarization:
-        pattern *= (1 + 0.1*np.sin(theta))
-    elif "LHCP" in polarization:
-        pattern *= (1 - 0.1*np.sin(theta))
-    return pattern
-
-pattern = get_pattern(model)
-pattern = apply_polarization(pattern)
-pattern /= np.max(pattern)
+show_3d = st.sidebar.checkbox("Show 3D Pattern", value=True)
+quality_3d = st.sidebar.selectbox("3D Quality", list(SURFACE_QUALITY), index=1)
+
+# widgets in the form only trigger a rerun when "Update" is pressed
+with st.sidebar.form("params"):
+    frequency = st.slider("Frequency (MHz)", 100, 60000, 3000)
+    gain = st.slider("Gain (dBi)", 0, 25, 8)
+    efficiency = st.slider("Efficiency (%)", 10, 100, 85)
+
+    elements = st.slider("Array Elements", 2, 128, 16)
+    spacing = st.slider("Element Spacing (λ)", 0.1, 2.0, 0.5)
+    phase = st.slider("Phase Shift (deg)", -180, 180, 0)
+
+    polarization = st.selectbox("Polarization",
+        ["Linear (Vertical)","Linear (Horizontal)","Circular (RHCP)","Circular (LHCP)"])
+
+    field_region = st.radio("Field Region", ["Far Field","Near Field"])
+
+    # RF parameters
+    st.subheader("RF Parameters")
+    Z0 = st.number_input("Characteristic Impedance Z0 (Ω)", value=50.0)
+    ZL = st.number_input("Load Impedance ZL (Ω)", value=75.0)
+    distance = st.number_input("Tx-Rx Distance (m)", value=10.0)
+    tx_power = st.number_input("Transmit Power (dBm)", value=20.0)
+
+    st.form_submit_button("Update")
+
+# ============================================================
+# RADIATION PATTERN
+# ============================================================
+# reruns that only touch display widgets reuse this session's last result
+pattern_key = (model, elements, spacing, phase, polarization)
+if st.session_state.get("pattern_key") != pattern_key:
+    st.session_state.pattern, peak_index = compute_pattern(*pattern_key)
+    st.session_state.beamwidth = half_power_beamwidth(st.session_state.pattern, peak_index)
+    st.session_state.near_pattern = near_field_pattern(st.session_state.pattern)
+    st.session_state.pattern_key = pattern_key
+pattern = st.session_state.pattern
 
 # ============================================================
 # METRICS
 # ============================================================
-half_power = np.max(pattern)/np.sqrt(2)
-indices = np.where(pattern >= half_power)[0]
-beamwidth = theta_deg[indices[-1]] - theta_deg[indices[0]]
+beamwidth = st.session_state.beamwidth
 directivity = gain * (efficiency/100)
 
 # ============================================================
@@ -123,20 +88,21 @@ st.markdown(f"### {family} → **{model}**")
 col1, col2 = st.columns([2.5,1])
 
 with col1:
-    fig, ax = plt.subplots(subplot_kw={'projection':'polar'})
-    ax.plot(theta, pattern)
-    ax.set_title("Radiation Pattern")
-    st.pyplot(fig)
+    fig2d = plot_2d_polar(pattern)
+    st.plotly_chart(fig2d, use_container_width=True)
 
     # 3D Pattern
-    phi = np.linspace(0,2*np.pi,180)
-    THETA,PHI = np.meshgrid(theta,phi)
-    R = np.tile(pattern,(len(phi),1))
-    X = R*np.sin(THETA)*np.cos(PHI)
-    Y = R*np.sin(THETA)*np.sin(PHI)
-    Z = R*np.cos(THETA)
-    fig3d = go.Figure(data=[go.Surface(x=X,y=Y,z=Z,surfacecolor=R)])
-    st.plotly_chart(fig3d, use_container_width=True)
+    if show_3d:
+        # one surface figure per session; only its mesh arrays are swapped
+        if "fig3d" not in st.session_state:
+            st.session_state.fig3d = go.Figure(data=[go.Surface()])
+        fig3d = st.session_state.fig3d
+        mesh_key = (pattern_key, quality_3d)
+        if st.session_state.get("mesh_key") != mesh_key:
+            X, Y, Z, R = surface_mesh(pattern, *SURFACE_QUALITY[quality_3d])
+            fig3d.data[0].update(x=X, y=Y, z=Z, surfacecolor=R)
+            st.session_state.mesh_key = mesh_key
+        st.plotly_chart(fig3d, use_container_width=True)
 
 with col2:
     st.subheader("Radiation Metrics")
@@ -167,7 +133,7 @@ st.header("📈 Smith Chart")
 z_norm = ZL / Z0
 gamma_complex = (z_norm - 1)/(z_norm + 1)
 
-theta_smith = np.linspace(0, 2*np.pi, 400)
+theta_smith = np.linspace(0, 2*np.pi, 400, dtype=np.float32)
 circle_x = np.cos(theta_smith)
 circle_y = np.sin(theta_smith)
 
@@ -213,30 +179,16 @@ st.write(f"Estimated Received Power: {rx_power:.2f} dBm")
 # ============================================================
 st.header("Near vs Far Field Comparison")
 
-near_pattern = pattern*(1/(1+theta**2))
-near_pattern /= np.max(near_pattern)
+near_pattern = st.session_state.near_pattern
 
-fig_nf, ax_nf = plt.subplots(subplot_kw={'projection':'polar'})
-ax_nf.plot(theta, near_pattern, label="Near Field")
-ax_nf.plot(theta, pattern, label="Far Field")
-ax_nf.legend()
-st.pyplot(fig_nf)
+fig_nf = plot_near_far(near_pattern, pattern)
+st.plotly_chart(fig_nf, use_container_width=True)
 
 # ============================================================
 # REFERENCE TABLE
 # ============================================================
-
-import pandas as pd
-
 st.header("📚 Antenna Quick Reference")
 
-ref_data = pd.DataFrame({
-    "Antenna": ["Dipole","Patch","Yagi","Dish","Horn"],
-    "Size": ["λ/2","λ/2","Multi","Large","Large"],
-    "Gain": ["2.15 dBi","6–9 dBi","10–15 dBi","30+ dBi","10–25 dBi"],
-    "Applications": ["TV, RF","WiFi, GPS","TV","Satellite","Radar"]
-})
-
-st.dataframe(ref_data, use_container_width=True)
+st.dataframe(REFERENCE_TABLE, use_container_width=True)
 
 st.caption("Developed by Aditya Dass — Advanced RF Antenna Research Tool")